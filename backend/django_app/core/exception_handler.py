@@ -4,12 +4,30 @@ from rest_framework.views import exception_handler
 
 logger = logging.getLogger(__name__)
 
+MAX_LOGGED_DETAIL_CHARS = 4096
+
+
+def _response_detail(response):
+    detail = str(getattr(response, 'data', None))
+    if len(detail) > MAX_LOGGED_DETAIL_CHARS:
+        return f'{detail[:MAX_LOGGED_DETAIL_CHARS]}...(truncated)'
+    return detail
+
 
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
+    if response is None or response.status_code >= 500:
+        level = logging.ERROR
+    elif response.status_code >= 400:
+        level = logging.WARNING
+    else:
+        return response
+    if not logger.isEnabledFor(level):
+        return response
+
     view = context.get('view')
     request = context.get('request')
-    view_name = view.__class__.__name__ if view else 'UnknownView'
+    view_name = type(view).__name__ if view else 'UnknownView'
     path = request.path if request else 'unknown'
     method = request.method if request else 'unknown'
 
@@ -27,16 +45,16 @@ def custom_exception_handler(exc, context):
             method,
             path,
             response.status_code,
-            getattr(response, 'data', None)
+            _response_detail(response)
         )
-    elif response.status_code >= 400:
+    else:
         logger.warning(
             'Client error response: view=%s method=%s path=%s status=%s detail=%s',
             view_name,
             method,
             path,
             response.status_code,
-            getattr(response, 'data', None)
+            _response_detail(response)
         )
 
     return response
@@ -0,0 +1,37 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    """Format records on the calling thread and write them to stderr from a listener thread.
+
+    The listener is started lazily per process: Celery prefork children and preloaded
+    gunicorn workers inherit this handler after fork but not the parent's listener thread.
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self.listener = None
+        self._listener_pid = None
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        # A fresh queue keeps a forked child from re-emitting records still pending in the parent's copy.
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, logging.StreamHandler(sys.stderr))
+        self.listener.start()
+        self._listener_pid = os.getpid()
+
+    def _stop_listener(self):
+        if self.listener is not None and self._listener_pid == os.getpid():
+            self.listener.stop()
+
+    def emit(self, record):
+        # handle() holds self.lock here, and logging re-creates handler locks after fork.
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
@@ -1,14 +1,20 @@
 from pathlib import Path
-import os
-from dotenv import load_dotenv
+import environ
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-load_dotenv(BASE_DIR.parent / '.env')
+env = environ.Env()
+environ.Env.read_env(BASE_DIR.parent / '.env')
 
-SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'dev-secret-key')
-DEBUG = os.environ.get('DJANGO_DEBUG', '0') == '1'
-ALLOWED_HOSTS = [h.strip() for h in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',') if h.strip()]
-render_host = os.environ.get('RENDER_EXTERNAL_HOSTNAME')
+
+def _env_list(var, default):
+    # django-environ drops empty items before the cast, so 'a, ' would still leave a blank entry.
+    return [item for item in env.list(var, cast=str.strip, default=default) if item]
+
+
+SECRET_KEY = env.str('DJANGO_SECRET_KEY', default='dev-secret-key')
+DEBUG = env.bool('DJANGO_DEBUG', default=False)
+ALLOWED_HOSTS = _env_list('DJANGO_ALLOWED_HOSTS', default=['localhost', '127.0.0.1'])
+render_host = env.str('RENDER_EXTERNAL_HOSTNAME', default='')
 if render_host and render_host not in ALLOWED_HOSTS:
     ALLOWED_HOSTS.append(render_host)
 
@@ -66,11 +72,17 @@ ASGI_APPLICATION = 'core.asgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.environ.get('POSTGRES_DB', 'map4expo'),
-        'USER': os.environ.get('POSTGRES_USER', 'map4expo'),
-        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'map4expo'),
-        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
-        'PORT': os.environ.get('POSTGRES_PORT', '5432')
+        'NAME': env.str('POSTGRES_DB', default='map4expo'),
+        'USER': env.str('POSTGRES_USER', default='map4expo'),
+        'PASSWORD': env.str('POSTGRES_PASSWORD', default='map4expo'),
+        'HOST': env.str('POSTGRES_HOST', default='localhost'),
+        'PORT': env.str('POSTGRES_PORT', default='5432'),
+        # Keep 0 under ASGI (the deployed uvicorn mode): each request runs in a fresh thread, so
+        # persistent connections are never reused and pile up. Raise it for WSGI, Celery or pgbouncer.
+        'CONN_MAX_AGE': env.int('DJANGO_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': True,
+        # Set when connecting through pgbouncer in transaction pooling mode.
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DJANGO_DISABLE_SERVER_SIDE_CURSORS', default=False),
     }
 }
 
@@ -116,19 +128,19 @@ SOCIALACCOUNT_PROVIDERS = {
         'SCOPE': ['profile', 'email'],
         'AUTH_PARAMS': {'access_type': 'online'},
         'APP': {
-            'client_id': os.environ.get('GOOGLE_CLIENT_ID', ''),
-            'secret': os.environ.get('GOOGLE_CLIENT_SECRET', ''),
+            'client_id': env.str('GOOGLE_CLIENT_ID', default=''),
+            'secret': env.str('GOOGLE_CLIENT_SECRET', default=''),
             'key': '',
         },
     }
 }
 
-CORS_ALLOWED_ORIGINS = [o.strip() for o in os.environ.get('CORS_ALLOWED_ORIGINS', 'http://localhost:5173,http://127.0.0.1:5173').split(',') if o.strip()]
+CORS_ALLOWED_ORIGINS = _env_list('CORS_ALLOWED_ORIGINS', default=['http://localhost:5173', 'http://127.0.0.1:5173'])
 CORS_ALLOW_CREDENTIALS = True
-CSRF_TRUSTED_ORIGINS = [o.strip() for o in os.environ.get('CSRF_TRUSTED_ORIGINS', 'http://localhost:5173,http://127.0.0.1:5173').split(',') if o.strip()]
+CSRF_TRUSTED_ORIGINS = _env_list('CSRF_TRUSTED_ORIGINS', default=['http://localhost:5173', 'http://127.0.0.1:5173'])
 
-LOGIN_REDIRECT_URL = os.environ.get('LOGIN_REDIRECT_URL', 'http://localhost:5173')
-LOGOUT_REDIRECT_URL = os.environ.get('LOGOUT_REDIRECT_URL', 'http://localhost:5173')
+LOGIN_REDIRECT_URL = env.str('LOGIN_REDIRECT_URL', default='http://localhost:5173')
+LOGOUT_REDIRECT_URL = env.str('LOGOUT_REDIRECT_URL', default='http://localhost:5173')
 
 REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'core.exception_handler.custom_exception_handler',
@@ -146,7 +158,7 @@ REST_FRAMEWORK = {
     },
 }
 
-if os.environ.get('DJANGO_ENV') == 'production':
+if env.str('DJANGO_ENV', default='') == 'production':
     SECURE_SSL_REDIRECT = True
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
@@ -155,11 +167,41 @@ if os.environ.get('DJANGO_ENV') == 'production':
     SECURE_HSTS_PRELOAD = True
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer'
+REDIS_URL = env.str('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+CELERY_BROKER_URL = env.str('CELERY_BROKER_URL', default='')
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.pubsub.RedisPubSubChannelLayer',
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer'
+        }
     }
-}
 
 LOGGING = {
     'version': 1,
@@ -171,7 +213,7 @@ LOGGING = {
     },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            'class': 'core.log_handlers.QueuedStreamHandler',
             'formatter': 'standard'
         }
     },
@@ -1,5 +1,15 @@
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+from .models import Profile
+
+SESSION_PROFILE_ID_KEY = 'event_profile_id'
+
+
+@database_sync_to_async
+def _profile_id_for_user(user_id):
+    return Profile.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+
 
 class MessageConsumer(AsyncJsonWebsocketConsumer):
     async def connect(self):
@@ -8,12 +18,16 @@ class MessageConsumer(AsyncJsonWebsocketConsumer):
             await self.close()
             return
 
-        profile = getattr(user, 'event_profile', None)
-        if not profile:
+        # The session is already loaded by AuthMiddlewareStack, so a cached id costs no query.
+        session = self.scope.get('session')
+        profile_id = session.get(SESSION_PROFILE_ID_KEY) if session is not None else None
+        if profile_id is None:
+            profile_id = await _profile_id_for_user(user.id)
+        if not profile_id:
             await self.close()
             return
 
-        self.group_name = f'profile_{profile.id}'
+        self.group_name = f'profile_{profile_id}'
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
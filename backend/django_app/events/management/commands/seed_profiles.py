@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from events.match_service import create_or_update_profile_matches
+from django.utils import timezone
+from events.match_service import run_profile_matches
 from events.models import Meetup, Profile
 
 
@@ -54,17 +55,35 @@ class Command(BaseCommand):
             }
         ]
 
-        upserted = 0
-        for item in data:
-            profile, _ = Profile.objects.update_or_create(
-                display_name=item['display_name'],
-                tag=item['tag'],
-                defaults=item
+        existing = {
+            (profile.display_name, profile.tag): profile
+            for profile in Profile.objects.filter(
+                display_name__in=[item['display_name'] for item in data],
+                tag__in=[item['tag'] for item in data],
             )
-            create_or_update_profile_matches(profile)
-            upserted += 1
+        }
+        to_update = []
+        to_create = []
+        now = timezone.now()
+        for item in data:
+            profile = existing.get((item['display_name'], item['tag']))
+            if profile is None:
+                to_create.append(Profile(**item))
+                continue
+            for key, value in item.items():
+                setattr(profile, key, value)
+            profile.updated_at = now
+            to_update.append(profile)
+
+        # bulk_update skips auto_now, so updated_at is stamped above and written explicitly.
+        update_fields = [key for key in data[0] if key not in ('display_name', 'tag')] + ['updated_at']
+        if to_update:
+            Profile.objects.bulk_update(to_update, update_fields)
+        created = Profile.objects.bulk_create(to_create)
+        seeded = to_update + created
+        run_profile_matches(seeded)
 
-        self.stdout.write(self.style.SUCCESS(f'Seeded {upserted} profiles.'))
+        self.stdout.write(self.style.SUCCESS(f'Seeded {len(seeded)} profiles.'))
 
         organizer = Profile.objects.filter(display_name='Arjun Mehta').first()
         if organizer:
@@ -1,7 +1,19 @@
-import json
+import atexit
+import hashlib
+import logging
 import os
 import threading
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+import httpx
+import numpy as np
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
 
 try:
     from openai import OpenAI
@@ -9,15 +21,28 @@ except Exception:  # pragma: no cover - optional in local setup
     OpenAI = None
 
 from .models import Profile, ProfileMatch
-from pgvector.django import CosineDistance
+from pgvector.django import MaxInnerProduct
 
+logger = logging.getLogger(__name__)
 
 OPENAI_MATCH_MODEL = os.environ.get('OPENAI_MATCH_MODEL', 'gpt-5-nano')
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
 OPENAI_EMBEDDING_MODEL = os.environ.get('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
 OPENAI_EMBEDDING_DIM = int(os.environ.get('OPENAI_EMBEDDING_DIM', '1536'))
+OPENAI_EMBEDDING_BATCH_SIZE = int(os.environ.get('OPENAI_EMBEDDING_BATCH_SIZE', '100'))
 MATCH_CANDIDATE_LIMIT = int(os.environ.get('MATCH_CANDIDATE_LIMIT', '20'))
+# Scoring only reads these columns; leaving out the 1536-dim embedding keeps candidate rows small.
+MATCH_CANDIDATE_FIELDS = ('id', 'display_name', 'event_name', 'pitch_text')
+MATCH_HNSW_EF_SEARCH = int(os.environ.get('MATCH_HNSW_EF_SEARCH', '40'))
+# Opt-in: up to this many embedded profiles, similarity is computed in-process instead of via the HNSW index.
+MATCH_INPROCESS_MAX_PROFILES = int(os.environ.get('MATCH_INPROCESS_MAX_PROFILES', '0'))
+MATCH_EMBEDDING_CACHE_TTL = float(os.environ.get('MATCH_EMBEDDING_CACHE_TTL', '60'))
 MESSAGE_MATCH_THRESHOLD = int(os.environ.get('MESSAGE_MATCH_THRESHOLD', '60'))
+# Candidates further than this cosine distance are not sent to the LLM scorer.
+MATCH_PRUNE_COSINE_MAX = float(os.environ.get('MATCH_PRUNE_COSINE_MAX', '0.55'))
+MATCH_SCORE_CONCURRENCY = int(os.environ.get('MATCH_SCORE_CONCURRENCY', '8'))
+OPENAI_TIMEOUT_SECONDS = float(os.environ.get('OPENAI_TIMEOUT_SECONDS', '30'))
+MATCH_CACHE_TIMEOUT = int(os.environ.get('MATCH_CACHE_TIMEOUT', str(86400 * 30)))
 DEFAULT_OPENAI_MATCH_PROMPT = (
     'You are an intent-matching engine for expo networking.\n'
     'Given two short voice-pitch transcripts, score how useful a 1:1 meeting would be.\n\n'
@@ -45,6 +70,30 @@ OPENAI_MATCH_PROMPT_TEMPLATE = os.environ.get(
     'OPENAI_MATCH_PROMPT',
     os.environ.get('GEMINI_MATCH_PROMPT', DEFAULT_OPENAI_MATCH_PROMPT)
 ).replace('\\n', '\n')
+PROMPT_PLACEHOLDERS = ('profile_a_pitch', 'profile_b_pitch', 'profile_a_name', 'profile_b_name', 'event_name')
+
+# One pooled client per process: keeps TLS connections to the API alive across calls.
+# httpx.Client is thread-safe, so the match worker threads share it.
+_CLIENT = (
+    OpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            timeout=OPENAI_TIMEOUT_SECONDS,
+        ),
+    )
+    if OPENAI_API_KEY and OpenAI is not None
+    else None
+)
+
+# Latest _EmbeddingSnapshot for this process, or None before the first read.
+_EMBEDDING_MATRIX = None
+_EMBEDDING_MATRIX_LOCK = threading.Lock()
+
+# Bounded worker pool for background matching when no Celery broker is configured.
+MATCH_POOL_SIZE = int(os.environ.get('MATCH_POOL_SIZE', '4'))
+_MATCH_POOL = ThreadPoolExecutor(max_workers=MATCH_POOL_SIZE, thread_name_prefix='match')
+atexit.register(_MATCH_POOL.shutdown, wait=False)
 
 
 @dataclass
@@ -53,88 +102,270 @@ class MatchResult:
     reason: str
 
 
-def _fallback_score(profile_a: Profile, profile_b: Profile) -> MatchResult:
-    tokens_a = set((profile_a.pitch_text or '').lower().split())
-    tokens_b = set((profile_b.pitch_text or '').lower().split())
+@dataclass(frozen=True)
+class _EmbeddingSnapshot:
+    built_at: float
+    # None when the corpus is larger than MATCH_INPROCESS_MAX_PROFILES.
+    ids: np.ndarray | None
+    matrix: np.ndarray | None
+    # Highest profile id read so far, plus read ids whose embedding was still missing.
+    max_id: int = 0
+    pending_ids: frozenset = frozenset()
+
+
+def _pitch_tokens(profile: Profile) -> frozenset:
+    return frozenset((profile.pitch_text or '').lower().split())
+
+
+def _fallback_score(tokens_a: frozenset, tokens_b: frozenset) -> MatchResult:
     if not tokens_a:
         return MatchResult(score=0, reason='Insufficient pitch data')
-    overlap = len(tokens_a.intersection(tokens_b))
+    overlap = len(tokens_a & tokens_b)
     score = int(min(95, 35 + (overlap / max(1, len(tokens_a))) * 65))
     return MatchResult(score=score, reason='Token-overlap fallback score')
 
 
+def _compile_prompt_template(template: str) -> str:
+    # Escape every brace (the default prompt embeds a JSON example), then re-open the known placeholders.
+    compiled = template.replace('{', '{{').replace('}', '}}')
+    for name in PROMPT_PLACEHOLDERS:
+        compiled = compiled.replace('{{%s}}' % name, '{%s}' % name)
+    return compiled
+
+
 def _render_prompt(template: str, profile_a: Profile, profile_b: Profile) -> str:
-    prompt = template
-    replacements = {
-        '{profile_a_pitch}': profile_a.pitch_text or '',
-        '{profile_b_pitch}': profile_b.pitch_text or '',
-        '{profile_a_name}': profile_a.display_name or '',
-        '{profile_b_name}': profile_b.display_name or '',
-        '{event_name}': profile_a.event_name or profile_b.event_name or 'India AI Summit',
-    }
-    for key, value in replacements.items():
-        prompt = prompt.replace(key, value)
-    return prompt
+    return template.format_map(
+        {
+            'profile_a_pitch': profile_a.pitch_text or '',
+            'profile_b_pitch': profile_b.pitch_text or '',
+            'profile_a_name': profile_a.display_name or '',
+            'profile_b_name': profile_b.display_name or '',
+            'event_name': profile_a.event_name or profile_b.event_name or 'India AI Summit',
+        }
+    )
+
+
+_MATCH_PROMPT_FORMAT = _compile_prompt_template(OPENAI_MATCH_PROMPT_TEMPLATE)
 
 
 def _parse_match_json(text: str) -> MatchResult:
-    parsed = json.loads(text)
+    parsed = orjson.loads(text)
     score = int(parsed.get('match_score', 0))
     reason = str(parsed.get('reasoning', 'No reason provided')).strip()[:240]
     score = max(0, min(100, score))
     return MatchResult(score=score, reason=reason or 'No reason provided')
 
 
-def _get_embedding(text: str) -> list | None:
-    if not OPENAI_API_KEY or OpenAI is None:
-        return None
-    if not text.strip():
+def _normalize(embedding) -> list:
+    # Unit-length vectors make cosine distance equal to 1 - inner product, so the index can use vector_ip_ops.
+    vector = np.asarray(embedding, dtype=np.float32)
+    return (vector / max(float(np.linalg.norm(vector)), 1e-12)).tolist()
+
+
+def _get_embeddings(texts: list[str]) -> list | None:
+    if _CLIENT is None:
         return None
+    if not texts:
+        return []
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.embeddings.create(
+        response = _CLIENT.embeddings.create(
             model=OPENAI_EMBEDDING_MODEL,
-            input=text,
+            input=texts,
             dimensions=OPENAI_EMBEDDING_DIM,
         )
-        return response.data[0].embedding
+        return [_normalize(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
     except Exception:
         return None
 
 
-def ensure_profile_embedding(profile: Profile) -> None:
-    if profile.embedding is not None:
+def _embed_profiles(profiles) -> None:
+    missing = [p for p in profiles if (p.pitch_text or '').strip()]
+    batches = [
+        missing[start:start + OPENAI_EMBEDDING_BATCH_SIZE]
+        for start in range(0, len(missing), OPENAI_EMBEDDING_BATCH_SIZE)
+    ]
+    texts = [[p.pitch_text for p in batch] for batch in batches]
+    if len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=max(1, min(MATCH_SCORE_CONCURRENCY, len(batches)))) as pool:
+            results = list(pool.map(_get_embeddings, texts))
+    else:
+        results = [_get_embeddings(batch_texts) for batch_texts in texts]
+    embedded = []
+    for batch, embeddings in zip(batches, results):
+        if not embeddings:
+            continue
+        for profile, embedding in zip(batch, embeddings):
+            profile.embedding = embedding
+        embedded.extend(batch)
+    if not embedded:
         return
-    embedding = _get_embedding(profile.pitch_text or '')
-    if embedding is None:
+    Profile.objects.bulk_update(embedded, ['embedding'])
+    _upsert_embedding_matrix([(p.id, p.embedding) for p in embedded])
+
+
+def ensure_profile_embeddings(profiles) -> None:
+    _embed_profiles([p for p in profiles if p.embedding is None])
+
+
+def ensure_profile_embedding(profile: Profile) -> None:
+    ensure_profile_embeddings([profile])
+
+
+def _with_rows(snapshot, rows):
+    ids, matrix = snapshot.ids, snapshot.matrix
+    vectors = np.vstack([np.asarray(embedding, dtype=np.float32) for _, embedding in rows])
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    positions = {profile_id: index for index, profile_id in enumerate(ids.tolist())}
+    replaced = [(positions[profile_id], row) for row, (profile_id, _) in enumerate(rows) if profile_id in positions]
+    appended = [row for row, (profile_id, _) in enumerate(rows) if profile_id not in positions]
+    if replaced:
+        # Copy rather than write in place: other threads may be ranking against the current matrix.
+        matrix = matrix.copy()
+        for index, row in replaced:
+            matrix[index] = vectors[row]
+    if appended:
+        ids = np.concatenate([ids, np.array([rows[row][0] for row in appended], dtype=np.int64)])
+        matrix = vectors[appended] if matrix is None else np.vstack([matrix, vectors[appended]])
+    if len(ids) > MATCH_INPROCESS_MAX_PROFILES:
+        return _EmbeddingSnapshot(snapshot.built_at, None, None)
+    return replace(snapshot, ids=ids, matrix=matrix)
+
+
+def _read_rows(snapshot, rows):
+    embedded = [row for row in rows if row[1] is not None]
+    snapshot = replace(
+        snapshot,
+        max_id=max([snapshot.max_id, *(row[0] for row in rows)]),
+        pending_ids=(snapshot.pending_ids - {row[0] for row in embedded}) | {row[0] for row in rows if row[1] is None},
+    )
+    return _with_rows(snapshot, embedded) if embedded else snapshot
+
+
+def _upsert_embedding_matrix(rows) -> None:
+    # Patch this process's own writes into the snapshot instead of forcing a full rebuild.
+    global _EMBEDDING_MATRIX
+    if MATCH_INPROCESS_MAX_PROFILES <= 0 or not rows:
         return
-    profile.embedding = embedding
-    profile.save(update_fields=['embedding'])
+    with _EMBEDDING_MATRIX_LOCK:
+        snapshot = _EMBEDDING_MATRIX
+        if snapshot is not None and snapshot.ids is not None:
+            _EMBEDDING_MATRIX = _with_rows(replace(snapshot, pending_ids=snapshot.pending_ids - {row[0] for row in rows}), rows)
+
+
+def _embedding_matrix():
+    global _EMBEDDING_MATRIX
+    with _EMBEDDING_MATRIX_LOCK:
+        snapshot = _EMBEDDING_MATRIX
+        if snapshot is None or time.monotonic() - snapshot.built_at >= MATCH_EMBEDDING_CACHE_TTL:
+            # The TTL rebuild also picks up re-embedded rows written by other processes.
+            if Profile.objects.exclude(embedding__isnull=True).count() > MATCH_INPROCESS_MAX_PROFILES:
+                snapshot = _EmbeddingSnapshot(time.monotonic(), None, None)
+            else:
+                empty = _EmbeddingSnapshot(time.monotonic(), np.empty(0, dtype=np.int64), None)
+                snapshot = _read_rows(empty, list(Profile.objects.values_list('id', 'embedding')))
+        elif snapshot.ids is not None:
+            # Only profiles created since the last read, or still waiting for an embedding then; both hit the PK index.
+            rows = list(
+                Profile.objects.filter(Q(id__gt=snapshot.max_id) | Q(id__in=snapshot.pending_ids))
+                .values_list('id', 'embedding')
+            )
+            snapshot = _read_rows(snapshot, rows)
+        _EMBEDDING_MATRIX = snapshot
+    return snapshot
+
+
+def _nearest_profile_ids(profile: Profile):
+    if MATCH_INPROCESS_MAX_PROFILES <= 0:
+        return None
+    snapshot = _embedding_matrix()
+    ids, matrix = snapshot.ids, snapshot.matrix
+    if matrix is None:
+        return None
+    query = np.asarray(profile.embedding, dtype=np.float32)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+    keep = ids != profile.id
+    ids = ids[keep]
+    similarities = (matrix @ query)[keep]
+    k = min(MATCH_CANDIDATE_LIMIT, len(ids))
+    if k == 0:
+        return [], []
+    top = np.argpartition(-similarities, k - 1)[:k] if len(ids) > k else np.arange(len(ids))
+    top = top[np.argsort(-similarities[top], kind='stable')]
+    return ids[top].tolist(), (1.0 - similarities[top]).tolist()
 
 
 def _candidate_profiles(profile: Profile):
+    candidates = Profile.objects.exclude(id=profile.id).only(*MATCH_CANDIDATE_FIELDS)
     if profile.embedding is None:
-        return Profile.objects.exclude(id=profile.id).order_by('-created_at')[:MATCH_CANDIDATE_LIMIT]
-    return (
-        Profile.objects.exclude(id=profile.id)
-        .exclude(embedding__isnull=True)
-        .annotate(distance=CosineDistance('embedding', profile.embedding))
-        .order_by('distance')[:MATCH_CANDIDATE_LIMIT]
+        return (
+            candidates.annotate(
+                missing_embedding=ExpressionWrapper(Q(embedding__isnull=True), output_field=BooleanField())
+            )
+            .order_by('-created_at')[:MATCH_CANDIDATE_LIMIT]
+        )
+    nearest = _nearest_profile_ids(profile)
+    if nearest is not None:
+        nearest_ids, distances = nearest
+        by_id = candidates.in_bulk(nearest_ids)
+        ordered = []
+        for profile_id, distance in zip(nearest_ids, distances):
+            other = by_id.get(profile_id)
+            if other is not None:
+                other.distance = distance
+                ordered.append(other)
+        return ordered
+    # ef_search must cover the LIMIT or the HNSW scan can return fewer rows than requested.
+    with connection.cursor() as cursor:
+        cursor.execute(f'SET hnsw.ef_search = {max(MATCH_HNSW_EF_SEARCH, MATCH_CANDIDATE_LIMIT)}')
+    nearest_profiles = list(
+        candidates.exclude(embedding__isnull=True)
+        .annotate(negative_inner_product=MaxInnerProduct('embedding', profile.embedding))
+        .order_by('negative_inner_product')[:MATCH_CANDIDATE_LIMIT]
     )
+    for other in nearest_profiles:
+        other.distance = 1.0 + other.negative_inner_product
+    return nearest_profiles
 
 
-def _openai_score(profile_a: Profile, profile_b: Profile) -> MatchResult:
-    if not OPENAI_API_KEY or OpenAI is None:
-        return _fallback_score(profile_a, profile_b)
+def _match_cache_key(prompt: str) -> str:
+    digest = hashlib.sha256(f'{OPENAI_MATCH_MODEL}\0{prompt}'.encode()).hexdigest()
+    return f'match:{digest}'
 
+
+def _get_cached_match(key: str) -> MatchResult | None:
     try:
-        prompt = _render_prompt(OPENAI_MATCH_PROMPT_TEMPLATE, profile_a, profile_b)
+        cached = cache.get(key)
     except Exception:
-        prompt = _render_prompt(DEFAULT_OPENAI_MATCH_PROMPT, profile_a, profile_b)
+        return None
+    return MatchResult(**cached) if cached else None
 
+
+def _set_cached_match(key: str, result: MatchResult) -> None:
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        response = client.chat.completions.create(
+        cache.set(key, {'score': result.score, 'reason': result.reason}, timeout=MATCH_CACHE_TIMEOUT)
+    except Exception:
+        pass
+
+
+def _openai_score(
+    profile_a: Profile,
+    profile_b: Profile,
+    tokens_a: frozenset,
+    tokens_b: frozenset,
+) -> MatchResult:
+    if _CLIENT is None:
+        return _fallback_score(tokens_a, tokens_b)
+
+    prompt = _render_prompt(_MATCH_PROMPT_FORMAT, profile_a, profile_b)
+
+    # The rendered prompt covers every input the model sees, so unchanged pitches reuse the last score.
+    cache_key = _match_cache_key(prompt)
+    cached = _get_cached_match(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = _CLIENT.chat.completions.create(
             model=OPENAI_MATCH_MODEL,
             messages=[
                 {'role': 'system', 'content': 'Return only valid JSON.'},
@@ -143,62 +374,144 @@ def _openai_score(profile_a: Profile, profile_b: Profile) -> MatchResult:
         )
         content = (response.choices[0].message.content or '').strip()
         if not content:
-            return _fallback_score(profile_a, profile_b)
+            return _fallback_score(tokens_a, tokens_b)
 
         try:
-            return _parse_match_json(content)
+            result = _parse_match_json(content)
         except Exception:
             start = content.find('{')
             end = content.rfind('}')
-            if start != -1 and end != -1 and end > start:
-                return _parse_match_json(content[start:end + 1])
-            return _fallback_score(profile_a, profile_b)
+            if start == -1 or end == -1 or end <= start:
+                return _fallback_score(tokens_a, tokens_b)
+            result = _parse_match_json(content[start:end + 1])
     except Exception:
-        return _fallback_score(profile_a, profile_b)
+        return _fallback_score(tokens_a, tokens_b)
+
+    _set_cached_match(cache_key, result)
+    return result
 
 
 def get_stored_match_score(profile_a: Profile, profile_b: Profile) -> int:
-    match = ProfileMatch.objects.filter(source_profile=profile_a, target_profile=profile_b).first()
-    if match:
-        return match.match_score
-    return _fallback_score(profile_a, profile_b).score
+    score = (
+        ProfileMatch.objects.filter(source_profile=profile_a, target_profile=profile_b)
+        .values_list('match_score', flat=True)
+        .first()
+    )
+    if score is not None:
+        return score
+    return _fallback_score(_pitch_tokens(profile_a), _pitch_tokens(profile_b)).score
+
+
+def can_message_score(score: int) -> bool:
+    return score >= MESSAGE_MATCH_THRESHOLD
 
 
 def can_message_profiles(profile_a: Profile, profile_b: Profile) -> bool:
-    return get_stored_match_score(profile_a, profile_b) >= MESSAGE_MATCH_THRESHOLD
+    return can_message_score(get_stored_match_score(profile_a, profile_b))
+
+
+def can_message_profiles_cached(request, profile_a: Profile, profile_b: Profile) -> bool:
+    # Scores are directional, so the memo key keeps the (a, b) order.
+    memo = getattr(request, '_can_message_cache', None)
+    if memo is None:
+        memo = request._can_message_cache = {}
+    key = (profile_a.id, profile_b.id)
+    if key not in memo:
+        memo[key] = can_message_profiles(profile_a, profile_b)
+    return memo[key]
+
+
+def _score_pair(job: tuple[Profile, Profile, frozenset, frozenset]) -> MatchResult:
+    return _openai_score(*job)
+
+
+def _pruned_score(tokens_a: frozenset, tokens_b: frozenset) -> MatchResult:
+    fallback = _fallback_score(tokens_a, tokens_b)
+    return MatchResult(
+        score=max(0, min(fallback.score, MESSAGE_MATCH_THRESHOLD - 1)),
+        reason='Low embedding similarity',
+    )
 
 
 def create_or_update_profile_matches(new_profile: Profile) -> None:
     ensure_profile_embedding(new_profile)
-    others = _candidate_profiles(new_profile)
+    others = list(_candidate_profiles(new_profile))
+    if not others:
+        return
+    _embed_profiles([p for p in others if getattr(p, 'missing_embedding', False)])
+
+    # Tokenize each pitch once; every pair reuses the sets for the fallback score.
+    tokens = {p.id: _pitch_tokens(p) for p in [new_profile, *others]}
+    pairs = []
+    pruned = []
     for other in others:
-        ensure_profile_embedding(other)
-        result_ab = _openai_score(new_profile, other)
-        result_ba = _openai_score(other, new_profile)
-
-        ProfileMatch.objects.update_or_create(
-            source_profile=new_profile,
-            target_profile=other,
-            defaults={'match_score': result_ab.score, 'reasoning': result_ab.reason},
-        )
-        ProfileMatch.objects.update_or_create(
-            source_profile=other,
-            target_profile=new_profile,
-            defaults={'match_score': result_ba.score, 'reasoning': result_ba.reason},
+        distance = getattr(other, 'distance', None)
+        bucket = pruned if distance is not None and distance > MATCH_PRUNE_COSINE_MAX else pairs
+        bucket.append((new_profile, other))
+        bucket.append((other, new_profile))
+    jobs = [(source, target, tokens[source.id], tokens[target.id]) for source, target in pairs]
+    results = []
+    if jobs:
+        # Scoring is network-bound, so fan the chat completions out instead of paying one RTT per pair.
+        with ThreadPoolExecutor(max_workers=max(1, min(MATCH_SCORE_CONCURRENCY, len(jobs)))) as pool:
+            results = list(pool.map(_score_pair, jobs))
+    pairs += pruned
+    results += [_pruned_score(tokens[source.id], tokens[target.id]) for source, target in pruned]
+
+    rows = [
+        ProfileMatch(source_profile=source, target_profile=target, match_score=result.score, reasoning=result.reason)
+        for (source, target), result in zip(pairs, results)
+    ]
+    # Upsert in key order so concurrent runs over overlapping pairs lock rows in the same order.
+    rows.sort(key=lambda row: (row.source_profile_id, row.target_profile_id))
+    with transaction.atomic():
+        ProfileMatch.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['source_profile', 'target_profile'],
+            update_fields=['match_score', 'reasoning', 'updated_at'],
         )
 
 
+def _match_profile_worker(profile_id: int) -> None:
+    # Pool threads outlive requests, so expire persistent DB connections like a request would.
+    close_old_connections()
+    try:
+        profile = Profile.objects.get(id=profile_id)
+        create_or_update_profile_matches(profile)
+    except Exception:
+        logger.exception('Profile matching failed: profile_id=%s', profile_id)
+    finally:
+        close_old_connections()
+
+
 def schedule_profile_match(new_profile: Profile) -> None:
     if os.environ.get('MATCH_ASYNC', '1') != '1':
         create_or_update_profile_matches(new_profile)
         return
 
-    def _worker(profile_id: int) -> None:
-        try:
-            profile = Profile.objects.get(id=profile_id)
-            create_or_update_profile_matches(profile)
-        except Exception:
-            pass
+    if settings.CELERY_BROKER_URL:
+        from .tasks import score_profile
+
+        score_profile.delay(new_profile.id)
+        return
+
+    _MATCH_POOL.submit(_match_profile_worker, new_profile.id)
+
+
+def _match_profile_inline(profile: Profile) -> None:
+    try:
+        create_or_update_profile_matches(profile)
+    finally:
+        # Each pool thread opened its own connection; the pool is discarded after this call.
+        connection.close()
+
 
-    thread = threading.Thread(target=_worker, args=(new_profile.id,), daemon=True)
-    thread.start()
+def run_profile_matches(profiles) -> None:
+    if settings.CELERY_BROKER_URL:
+        from .tasks import score_profiles
+
+        score_profiles.delay([p.id for p in profiles])
+        return
+    with ThreadPoolExecutor(max_workers=max(1, MATCH_POOL_SIZE)) as pool:
+        list(pool.map(_match_profile_inline, profiles))
@@ -0,0 +1,22 @@
+from django.db import migrations
+from pgvector.django import HnswIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_profile_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=HnswIndex(
+                name='profile_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
+        ),
+    ]
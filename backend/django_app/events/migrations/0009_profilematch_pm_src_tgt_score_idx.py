@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_profile_embedding_hnsw'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profilematch',
+            index=models.Index(
+                fields=['source_profile', 'target_profile'],
+                include=['match_score'],
+                name='pm_src_tgt_score_idx',
+            ),
+        ),
+    ]
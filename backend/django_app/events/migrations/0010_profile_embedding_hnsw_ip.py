@@ -0,0 +1,26 @@
+from django.db import migrations
+from pgvector.django import HnswIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_profilematch_pm_src_tgt_score_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='profile',
+            name='profile_embedding_hnsw',
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=HnswIndex(
+                name='profile_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_ip_ops'],
+            ),
+        ),
+    ]
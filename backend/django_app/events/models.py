@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
-from pgvector.django import VectorField
+from pgvector.django import HnswIndex, VectorField
 
 
 class Profile(models.Model):
@@ -21,6 +21,18 @@ class Profile(models.Model):
     last_seen_at = models.DateTimeField(null=True, blank=True)
     embedding = VectorField(dimensions=1536, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            HnswIndex(
+                name='profile_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_ip_ops'],
+            ),
+        ]
 
     def __str__(self):
         return self.display_name
@@ -73,3 +85,10 @@ class ProfileMatch(models.Model):
 
     class Meta:
         unique_together = ('source_profile', 'target_profile')
+        indexes = [
+            models.Index(
+                fields=['source_profile', 'target_profile'],
+                include=['match_score'],
+                name='pm_src_tgt_score_idx',
+            ),
+        ]
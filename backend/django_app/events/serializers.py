@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .match_service import can_message_profiles
+from .match_service import can_message_profiles_cached
 from .models import Message, MessageThread, Meetup, MeetupInterest, Profile
 
 
@@ -10,7 +10,7 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Profile
-        fields = '__all__'
+        exclude = ['embedding']
 
     def get_profile_pic_uploaded_url(self, obj):
         if not obj.profile_pic:
@@ -29,7 +29,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             if viewer:
                 if viewer.id == obj.id:
                     return obj.pitch_text
-                if can_message_profiles(viewer, obj):
+                if can_message_profiles_cached(request, viewer, obj):
                     return obj.pitch_text
                 return ''
 
@@ -41,7 +41,7 @@ class ProfileSerializer(serializers.ModelSerializer):
                 return ''
             if viewer.id == obj.id:
                 return obj.pitch_text
-            if can_message_profiles(viewer, obj):
+            if can_message_profiles_cached(request, viewer, obj):
                 return obj.pitch_text
 
         return ''
@@ -55,7 +55,9 @@ class MeetupSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_up_for_it_count(self, obj):
-        return obj.interests.count()
+        # List/retrieve querysets annotate the count; freshly created or updated instances do not.
+        count = getattr(obj, 'up_for_it_count_ann', None)
+        return obj.interests.count() if count is None else count
 
 
 class MeetupInterestSerializer(serializers.ModelSerializer):
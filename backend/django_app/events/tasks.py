@@ -0,0 +1,19 @@
+from celery import shared_task
+from django.db import DatabaseError
+
+from .match_service import create_or_update_profile_matches
+from .models import Profile
+
+
+@shared_task(bind=True, max_retries=3, autoretry_for=(DatabaseError,), retry_backoff=True, acks_late=True)
+def score_profile(self, profile_id: int) -> None:
+    profile = Profile.objects.filter(id=profile_id).first()
+    if profile is None:
+        return
+    create_or_update_profile_matches(profile)
+
+
+@shared_task(bind=True, max_retries=3, autoretry_for=(DatabaseError,), retry_backoff=True, acks_late=True)
+def score_profiles(self, profile_ids: list[int]) -> None:
+    for profile in Profile.objects.filter(id__in=profile_ids):
+        create_or_update_profile_matches(profile)
@@ -1,12 +1,18 @@
-from datetime import datetime, timedelta
+import asyncio
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from urllib.parse import quote
 
-from django.db.models import Q
+from django.db.models import Count, Max, OuterRef, Prefetch, Q, Subquery
 from django.utils.decorators import method_decorator
 from django.contrib.auth import logout as django_logout
+from django.db import transaction
 from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import condition
+import hashlib
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -14,7 +20,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
-from .match_service import can_message_profiles, schedule_profile_match
+from .consumers import SESSION_PROFILE_ID_KEY
+from .match_service import can_message_profiles_cached, can_message_score, schedule_profile_match
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 from .models import Message, MessageThread, Meetup, MeetupInterest, Profile, ProfileMatch
@@ -26,22 +33,64 @@ from .serializers import (
 )
 
 
+# Shared across requests so Turnstile verification reuses pooled keep-alive connections.
+_TURNSTILE_SESSION = requests.Session()
+_TURNSTILE_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+
 def _request_profile(request):
     if request.user.is_authenticated:
         return getattr(request.user, 'event_profile', None)
     return None
 
 
+def _remember_profile_id(request, profile):
+    # Lets the websocket consumer resolve the profile group from the session without a query.
+    if request.session.get(SESSION_PROFILE_ID_KEY) != profile.id:
+        request.session[SESSION_PROFILE_ID_KEY] = profile.id
+
+
 def _require_human_verified(request):
     return
 
 
+@lru_cache(maxsize=64)
+def _auth_urls(frontend_origin):
+    encoded_origin = quote(frontend_origin, safe='')
+    login_url = f'/accounts/google/login/?process=login&prompt=select_account&next={encoded_origin}'
+    logout_url = f'/accounts/logout/?next={encoded_origin}'
+    return login_url, logout_url
+
+
+def _matches_etag(request, pk=None):
+    request_profile = _request_profile(request)
+    if not request_profile or str(request_profile.id) != str(pk):
+        return None
+    min_score = int(request.query_params.get('min_score', 60))
+    summary = ProfileMatch.objects.filter(source_profile_id=request_profile.id, match_score__gte=min_score).aggregate(
+        count=Count('id'),
+        latest=Max('updated_at'),
+        # The body also renders target profile fields, which change without touching the match rows.
+        latest_target=Max('target_profile__updated_at'),
+    )
+    raw = f"{request_profile.id}:{min_score}:{summary['count']}:{summary['latest']}:{summary['latest_target']}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+_WINDOW_ANCHOR_DATE = date(2000, 1, 1)
+
+
+@lru_cache(maxsize=1024)
+def _window_bounds(meetup_time):
+    # The +/-30 minute window only depends on the time of day, so any fixed date works as the anchor.
+    start_dt = datetime.combine(_WINDOW_ANCHOR_DATE, meetup_time)
+    return (start_dt - timedelta(minutes=30)).time(), (start_dt + timedelta(minutes=30)).time()
+
+
 def _overlapping_meetups_queryset(meetup_date, meetup_time):
     if not meetup_date or not meetup_time:
         return Meetup.objects.none()
-    start_dt = datetime.combine(meetup_date, meetup_time)
-    window_start = (start_dt - timedelta(minutes=30)).time()
-    window_end = (start_dt + timedelta(minutes=30)).time()
+    window_start, window_end = _window_bounds(meetup_time)
     return Meetup.objects.filter(
         meetup_date=meetup_date,
         meetup_time__isnull=False,
@@ -50,6 +99,32 @@ def _overlapping_meetups_queryset(meetup_date, meetup_time):
     )
 
 
+async def _broadcast(channel_layer, group_names, payload):
+    # One sync->async hop per request; the group sends then run concurrently on the event loop.
+    event = {'type': 'message_event', 'data': payload}
+    await asyncio.gather(*(channel_layer.group_send(group_name, event) for group_name in group_names))
+
+
+def _thread_summaries(request_profile):
+    last_body = Message.objects.filter(thread=OuterRef('pk')).order_by('-created_at').values('body')[:1]
+    threads = (
+        MessageThread.objects.filter(participants__id=request_profile.id)
+        .distinct()
+        .prefetch_related(Prefetch('participants', queryset=Profile.objects.only('id', 'tag')))
+        .annotate(last_body=Subquery(last_body))
+        .order_by('-updated_at')
+    )
+    return [
+        {
+            'id': thread.id,
+            'participants': [{'id': p.id, 'tag': p.tag} for p in thread.participants.all()],
+            'last_message': thread.last_body or '',
+            'updated_at': thread.updated_at,
+        }
+        for thread in threads
+    ]
+
+
 class ProfileViewSet(viewsets.ModelViewSet):
     queryset = Profile.objects.all().order_by('-created_at')
     serializer_class = ProfileSerializer
@@ -59,7 +134,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
         request_profile = _request_profile(self.request)
         if not request_profile:
             return Profile.objects.none()
-        return Profile.objects.filter(id=request_profile.id)
+        return Profile.objects.filter(id=request_profile.id).defer('embedding')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -75,9 +150,11 @@ class ProfileViewSet(viewsets.ModelViewSet):
             if existing is None:
                 profile.user = self.request.user
                 profile.save(update_fields=['user'])
+                _remember_profile_id(self.request, profile)
         schedule_profile_match(profile)
 
     @action(detail=True, methods=['get'])
+    @method_decorator(condition(etag_func=_matches_etag))
     def matches(self, request, pk=None):
         profile = self.get_object()
         request_profile = _request_profile(request)
@@ -87,6 +164,18 @@ class ProfileViewSet(viewsets.ModelViewSet):
         matches = (
             ProfileMatch.objects.filter(source_profile=profile, match_score__gte=min_score)
             .select_related('target_profile')
+            .only(
+                'match_score',
+                'reasoning',
+                'target_profile__id',
+                'target_profile__tag',
+                'target_profile__is_anonymous',
+                'target_profile__linkedin_url',
+                'target_profile__pinned_location',
+                'target_profile__profile_pic_url',
+                'target_profile__profile_pic',
+                'target_profile__pitch_text',
+            )
             .order_by('-match_score')
         )
         payload = []
@@ -101,7 +190,8 @@ class ProfileViewSet(viewsets.ModelViewSet):
                     'pinned_location': target.pinned_location,
                     'profile_pic_url': target.profile_pic_url,
                     'profile_pic_uploaded_url': request.build_absolute_uri(target.profile_pic.url) if target.profile_pic else '',
-                    'pitch_text': target.pitch_text if can_message_profiles(profile, target) else '',
+                    # The row is the stored profile -> target score, i.e. what can_message_profiles would look up.
+                    'pitch_text': target.pitch_text if can_message_score(m.match_score) else '',
                     'match_score': m.match_score,
                     'reasoning': m.reasoning,
                 }
@@ -114,9 +204,7 @@ class AuthMeView(APIView):
     @method_decorator(ensure_csrf_cookie)
     def get(self, request):
         frontend_origin = request.headers.get('Origin') or 'http://localhost:5173'
-        encoded_origin = quote(frontend_origin, safe='')
-        login_url = f'/accounts/google/login/?process=login&prompt=select_account&next={encoded_origin}'
-        logout_url = f'/accounts/logout/?next={encoded_origin}'
+        login_url, logout_url = _auth_urls(frontend_origin)
 
         if not request.user.is_authenticated:
             return Response(
@@ -128,6 +216,8 @@ class AuthMeView(APIView):
             )
 
         profile = getattr(request.user, 'event_profile', None)
+        if profile:
+            _remember_profile_id(request, profile)
         return Response(
             {
                 'authenticated': True,
@@ -157,7 +247,7 @@ class HumanVerifyView(APIView):
             return Response({'success': False, 'error': 'token is required'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            verify_response = requests.post(
+            verify_response = _TURNSTILE_SESSION.post(
                 'https://challenges.cloudflare.com/turnstile/v0/siteverify',
                 data={
                     'secret': secret,
@@ -191,6 +281,9 @@ class MeetupViewSet(viewsets.ModelViewSet):
     serializer_class = MeetupSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        return Meetup.objects.annotate(up_for_it_count_ann=Count('interests')).order_by('-created_at')
+
     def perform_create(self, serializer):
         request_profile = _request_profile(self.request)
         if not request_profile:
@@ -219,23 +312,24 @@ class MeetupViewSet(viewsets.ModelViewSet):
         if not profile:
             return Response({'error': 'not allowed'}, status=status.HTTP_403_FORBIDDEN)
 
-        interest, created = MeetupInterest.objects.get_or_create(meetup=meetup, profile=profile)
-        if not created:
-            interest.delete()
-            return Response({'status': 'removed', 'up_for_it_count': meetup.interests.count()})
-
-        if meetup.meetup_date and meetup.meetup_time:
-            overlapping_ids = _overlapping_meetups_queryset(meetup.meetup_date, meetup.meetup_time).exclude(id=meetup.id).values_list('id', flat=True)
-            overlap_interest_count = MeetupInterest.objects.filter(
-                profile=profile,
-                meetup_id__in=overlapping_ids,
-            ).count()
-            if overlap_interest_count >= 2:
-                interest.delete()
-                return Response(
-                    {'error': 'You can opt into at most 2 overlapping meetups (1 primary + 1 backup).'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        with transaction.atomic():
+            removed, _ = MeetupInterest.objects.filter(meetup=meetup, profile=profile).delete()
+            if removed:
+                return Response({'status': 'removed', 'up_for_it_count': meetup.interests.count()})
+
+            # Check the overlap limit before inserting so a rejected opt-in never touches the table.
+            if meetup.meetup_date and meetup.meetup_time:
+                overlap_interest_count = MeetupInterest.objects.filter(
+                    profile=profile,
+                    meetup__in=_overlapping_meetups_queryset(meetup.meetup_date, meetup.meetup_time).exclude(id=meetup.id),
+                ).count()
+                if overlap_interest_count >= 2:
+                    return Response(
+                        {'error': 'You can opt into at most 2 overlapping meetups (1 primary + 1 backup).'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+
+            MeetupInterest.objects.bulk_create([MeetupInterest(meetup=meetup, profile=profile)], ignore_conflicts=True)
 
         return Response({'status': 'added', 'up_for_it_count': meetup.interests.count()})
 
@@ -245,7 +339,9 @@ class MeetupViewSet(viewsets.ModelViewSet):
         if not profile:
             return Response({'error': 'not allowed'}, status=status.HTTP_403_FORBIDDEN)
 
-        meetups = Meetup.objects.filter(Q(organizer=profile) | Q(interests__profile=profile)).distinct().order_by('-created_at')
+        # Filter interests through a subquery: joining them here would make Count('interests') count only this profile.
+        interested_ids = MeetupInterest.objects.filter(profile=profile).values('meetup_id')
+        meetups = self.get_queryset().filter(Q(organizer=profile) | Q(id__in=interested_ids))
         payload = []
         for meetup in meetups:
             role = 'Organizer' if meetup.organizer_id == profile.id else 'Participant'
@@ -257,13 +353,13 @@ class MeetupViewSet(viewsets.ModelViewSet):
                 'meetup_date': meetup.meetup_date,
                 'meetup_time': meetup.meetup_time,
                 'role': role,
-                'up_for_it_count': meetup.interests.count()
+                'up_for_it_count': meetup.up_for_it_count_ann
             })
         return Response(payload)
 
 
 class MessageThreadViewSet(viewsets.ModelViewSet):
-    queryset = MessageThread.objects.all().order_by('-updated_at')
+    queryset = MessageThread.objects.prefetch_related('participants').order_by('-updated_at')
     serializer_class = MessageThreadSerializer
     permission_classes = [IsAuthenticated]
 
@@ -272,65 +368,43 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
         if not request_profile:
             return Response({'error': 'not allowed'}, status=status.HTTP_403_FORBIDDEN)
 
-        threads = MessageThread.objects.filter(participants__id=request_profile.id).distinct().order_by('-updated_at')
-        data = []
-        for thread in threads:
-            last_message = thread.messages.order_by('-created_at').first()
-            participants = list(thread.participants.values('id', 'tag'))
-            data.append({
-                'id': thread.id,
-                'participants': participants,
-                'last_message': last_message.body if last_message else '',
-                'updated_at': thread.updated_at,
-            })
-        return Response(data)
+        return Response(_thread_summaries(request_profile))
 
     @action(detail=False, methods=['get'])
     def poll(self, request):
         request_profile = _request_profile(request)
         if not request_profile:
             return Response({'error': 'not allowed'}, status=status.HTTP_403_FORBIDDEN)
-        threads = MessageThread.objects.filter(participants__id=request_profile.id).distinct().order_by('-updated_at')
-        data = []
-        for thread in threads:
-            last_message = thread.messages.order_by('-created_at').first()
-            participants = list(thread.participants.values('id', 'tag'))
-            data.append({
-                'id': thread.id,
-                'participants': participants,
-                'last_message': last_message.body if last_message else '',
-                'updated_at': thread.updated_at,
-            })
-        return Response(data)
+        return Response(_thread_summaries(request_profile))
 
     @action(detail=False, methods=['post'])
     def start(self, request):
-        request_profile = _request_profile(request)
-        sender_id = request_profile.id if request_profile else None
+        sender = _request_profile(request)
         recipient_id = request.data.get('recipient_profile_id')
         text = request.data.get('text', '').strip()
 
-        if not sender_id or not recipient_id or not text:
+        if not sender or not recipient_id or not text:
             return Response(
                 {'error': 'sender_profile_id, recipient_profile_id and text are required'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         try:
-            sender = Profile.objects.get(id=sender_id)
             recipient = Profile.objects.get(id=recipient_id)
         except (Profile.DoesNotExist, ValueError):
             return Response({'error': 'profile not found'}, status=status.HTTP_404_NOT_FOUND)
 
-        if not can_message_profiles(sender, recipient):
+        if not can_message_profiles_cached(request, sender, recipient):
             return Response({'error': 'Messaging requires >70% voice match'}, status=status.HTTP_403_FORBIDDEN)
 
-        thread = None
-        candidate_threads = MessageThread.objects.filter(participants=sender).filter(participants=recipient).distinct()
-        for t in candidate_threads:
-            if t.participants.count() == 2:
-                thread = t
-                break
+        # Annotate before filtering so the count covers all participants, not just the two filter joins.
+        thread = (
+            MessageThread.objects.annotate(participant_count=Count('participants'))
+            .filter(participants=sender)
+            .filter(participants=recipient)
+            .filter(participant_count=2)
+            .first()
+        )
         if thread is None:
             thread = MessageThread.objects.create()
             thread.participants.add(sender, recipient)
@@ -344,30 +418,23 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
                 'updated_at': thread.updated_at.isoformat(),
                 'message': MessageSerializer(message).data,
             }
-            async_to_sync(channel_layer.group_send)(f'profile_{sender.id}', {'type': 'message_event', 'data': payload})
-            async_to_sync(channel_layer.group_send)(f'profile_{recipient.id}', {'type': 'message_event', 'data': payload})
+            async_to_sync(_broadcast)(channel_layer, [f'profile_{sender.id}', f'profile_{recipient.id}'], payload)
         return Response({'thread_id': thread.id}, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['post'])
     def send(self, request, pk=None):
         thread = self.get_object()
-        request_profile = _request_profile(request)
-        sender_id = request_profile.id if request_profile else None
+        sender = _request_profile(request)
         text = request.data.get('text', '').strip()
 
-        if not sender_id or not text:
+        if not sender or not text:
             return Response({'error': 'sender_profile_id and text are required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            sender = Profile.objects.get(id=sender_id)
-        except (Profile.DoesNotExist, ValueError):
-            return Response({'error': 'sender profile not found'}, status=status.HTTP_404_NOT_FOUND)
-
-        if not thread.participants.filter(id=sender.id).exists():
+        participants = list(thread.participants.all())
+        if not any(p.id == sender.id for p in participants):
             return Response({'error': 'sender is not part of this thread'}, status=status.HTTP_403_FORBIDDEN)
 
-        participants = list(thread.participants.all())
-        if len(participants) == 2 and not can_message_profiles(participants[0], participants[1]):
+        if len(participants) == 2 and not can_message_profiles_cached(request, participants[0], participants[1]):
             return Response({'error': 'Messaging requires >70% voice match'}, status=status.HTTP_403_FORBIDDEN)
 
         message = Message.objects.create(thread=thread, sender=sender, body=text)
@@ -379,18 +446,14 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
                 'updated_at': thread.updated_at.isoformat(),
                 'message': MessageSerializer(message).data,
             }
-            for participant in thread.participants.all():
-                async_to_sync(channel_layer.group_send)(
-                    f'profile_{participant.id}',
-                    {'type': 'message_event', 'data': payload}
-                )
+            async_to_sync(_broadcast)(channel_layer, [f'profile_{p.id}' for p in participants], payload)
         return Response(MessageSerializer(message).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
         thread = self.get_object()
         request_profile = _request_profile(request)
-        if not request_profile or not thread.participants.filter(id=request_profile.id).exists():
+        if not request_profile or not any(p.id == request_profile.id for p in thread.participants.all()):
             return Response({'error': 'not allowed'}, status=status.HTTP_403_FORBIDDEN)
 
         messages = thread.messages.order_by('created_at')
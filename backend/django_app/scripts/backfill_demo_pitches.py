@@ -3,7 +3,9 @@ from __future__ import annotations
 import random
 from typing import List
 
-from events.match_service import create_or_update_profile_matches, ensure_profile_embedding
+from django.utils import timezone
+
+from events.match_service import ensure_profile_embeddings, run_profile_matches
 from events.models import Profile
 
 
@@ -56,18 +58,23 @@ def main() -> None:
     rng = random.Random(42)
     rng.shuffle(roles)
 
+    # bulk_update skips auto_now, so stamp updated_at explicitly for the matches ETag.
+    now = timezone.now()
     for idx, profile in enumerate(profiles):
         role = roles[idx % len(roles)]
         pitch = _pick_pitch(role, profile.id + idx)
         profile.tag = role
         profile.pitch_text = pitch
         profile.embedding = None
-        profile.save(update_fields=["tag", "pitch_text", "embedding"])
-        ensure_profile_embedding(profile)
+        profile.updated_at = now
+    Profile.objects.bulk_update(profiles, ["tag", "pitch_text", "embedding", "updated_at"], batch_size=500)
+
+    # Batched embeddings requests: one API call per OPENAI_EMBEDDING_BATCH_SIZE profiles, run concurrently.
+    ensure_profile_embeddings(profiles)
 
+    # Enqueued on Celery when a broker is configured, otherwise matched concurrently in-process.
     selected = profiles[:4]
-    for profile in selected:
-        create_or_update_profile_matches(profile)
+    run_profile_matches(selected)
 
     print(f"Updated pitches + embeddings for {len(profiles)} profiles.")
     print(f"Ran profile matching for profile IDs: {[p.id for p in selected]}")
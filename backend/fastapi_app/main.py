@@ -1,6 +1,7 @@
+import asyncio
 import os
-import tempfile
-import time
+import re
+import threading
 import logging
 from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, Request, Header
@@ -30,11 +31,32 @@ CORS_ORIGINS = os.getenv(
 FASTAPI_API_KEY = os.getenv('FASTAPI_API_KEY', '').strip()
 STT_MAX_MB = float(os.getenv('STT_MAX_MB', '10'))
 
+_OPENAI_CLIENT: Optional['OpenAI'] = None
+_OPENAI_CLIENT_LOCK = threading.Lock()
+
+CORS_ALLOWED_ORIGINS = frozenset(origin.strip() for origin in CORS_ORIGINS.split(',') if origin.strip())
+CORS_ORIGIN_PATTERN = re.compile(r"^https?://(localhost|127\.0\.0\.1|0\.0\.0\.0|192\.168\.\d+\.\d+)(:\d+)?$", re.ASCII)
+
+
+class OriginSetCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that checks exact origins with a set lookup before trying the LAN regex."""
+
+    def __init__(self, app, allow_origin_pattern=None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.allow_origin_set = frozenset(self.allow_origins)
+        self.allow_origin_pattern = allow_origin_pattern
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins or origin in self.allow_origin_set:
+            return True
+        return self.allow_origin_pattern is not None and self.allow_origin_pattern.fullmatch(origin) is not None
+
+
 app = FastAPI(title='Map4Expo API')
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[origin.strip() for origin in CORS_ORIGINS.split(',') if origin.strip()],
-    allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1|0\.0\.0\.0|192\.168\.\d+\.\d+)(:\d+)?$",
+    OriginSetCORSMiddleware,
+    allow_origins=list(CORS_ALLOWED_ORIGINS),
+    allow_origin_pattern=CORS_ORIGIN_PATTERN,
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
@@ -43,40 +65,41 @@ app.add_middleware(
 
 @app.middleware('http')
 async def log_requests(request: Request, call_next):
-    start = time.time()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
     try:
         response = await call_next(request)
     except Exception:
         logger.exception('Unhandled request error: method=%s path=%s', request.method, request.url.path)
         raise
-    duration_ms = round((time.time() - start) * 1000, 2)
     if response.status_code >= 500:
-        logger.error(
-            'HTTP %s %s -> %s in %sms',
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms
-        )
+        level = logging.ERROR
     elif response.status_code >= 400:
-        logger.warning(
-            'HTTP %s %s -> %s in %sms',
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms
-        )
+        level = logging.WARNING
     else:
-        logger.info(
+        level = logging.INFO
+    if logger.isEnabledFor(level):
+        logger.log(
+            level,
             'HTTP %s %s -> %s in %sms',
             request.method,
             request.url.path,
             response.status_code,
-            duration_ms
+            round((loop.time() - start) * 1000, 2)
         )
     return response
 
 
+def _get_openai(api_key: str) -> 'OpenAI':
+    # One client per process keeps its HTTP connection pool (and TLS sessions) warm between requests.
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        with _OPENAI_CLIENT_LOCK:
+            if _OPENAI_CLIENT is None:
+                _OPENAI_CLIENT = OpenAI(api_key=api_key)
+    return _OPENAI_CLIENT
+
+
 class VoicePitch(BaseModel):
     text: str
     event_name: str = 'India AI Summit'
@@ -100,18 +123,16 @@ async def health():
 
 @app.post('/stt')
 async def speech_to_text(audio: UploadFile = File(...), x_api_key: str | None = Header(default=None, alias='X-API-Key')):
-    temp_path = None
     try:
         if FASTAPI_API_KEY:
             if not x_api_key or x_api_key != FASTAPI_API_KEY:
                 return JSONResponse(status_code=401, content={'error': 'Unauthorized'})
         suffix = os.path.splitext(audio.filename or '')[1] or '.wav'
-        audio_bytes = await audio.read()
-        if len(audio_bytes) > STT_MAX_MB * 1024 * 1024:
+        # The upload is already spooled by Starlette; measure it in place instead of copying it.
+        audio.file.seek(0, os.SEEK_END)
+        if audio.file.tell() > STT_MAX_MB * 1024 * 1024:
             return JSONResponse(status_code=413, content={'error': f'Audio too large. Max {STT_MAX_MB}MB.'})
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as buffer:
-            buffer.write(audio_bytes)
-            temp_path = buffer.name
+        audio.file.seek(0)
 
         if OpenAI is None:
             logger.error('STT failed: openai package not installed')
@@ -134,12 +155,11 @@ async def speech_to_text(audio: UploadFile = File(...), x_api_key: str | None =
                 }
             )
 
-        client = OpenAI(api_key=api_key)
-        with open(temp_path, 'rb') as audio_handle:
-            transcript = client.audio.transcriptions.create(
-                model='whisper-1',
-                file=audio_handle
-            )
+        client = _get_openai(api_key)
+        transcript = client.audio.transcriptions.create(
+            model='whisper-1',
+            file=(f'audio{suffix}', audio.file, audio.content_type or 'application/octet-stream')
+        )
         logger.info('STT succeeded using OpenAI Whisper API')
         return {'text': transcript.text.strip()}
     except Exception as exc:
@@ -151,9 +171,6 @@ async def speech_to_text(audio: UploadFile = File(...), x_api_key: str | None =
                 'detail': str(exc)
             }
         )
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            os.remove(temp_path)
 
 
 @app.post('/match', response_model=List[MatchResult])